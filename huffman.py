@@ -172,18 +172,38 @@ def _rebuild_tree_from_codes(codes: dict) -> Node:
     return root
 
 
-def huffman_decompress_dsa(compressed_payload: bytes, codes: dict) -> bytes:
-    """Decompress Huffman-encoded payload using stored codes."""
+def _check_codes(codes: dict) -> None:
+    """Raise ValueError if the code table is not a valid prefix-free code."""
+    previous = None
+    for code in sorted(codes.values()):
+        if not code or code.strip('01'):
+            raise ValueError(f"Invalid Huffman code {code!r}")
+        # In sorted order, a prefix always sits directly before a code it prefixes
+        if previous is not None and code.startswith(previous):
+            raise ValueError(f"Code {previous!r} is a prefix of {code!r}")
+        previous = code
+
+
+def huffman_decompress_dsa(compressed_payload: bytes, codes: dict, strict: bool = False) -> bytes:
+    """Decompress Huffman payload; with strict=True raise ValueError on a malformed table, padding or bit stream."""
+    if strict:
+        if not compressed_payload and codes:
+            raise ValueError("Missing Huffman payload")
+        if compressed_payload and not codes:
+            raise ValueError("Missing Huffman code table")
+        _check_codes(codes)
+
     if not compressed_payload or not codes:
         return b''
 
     padding = compressed_payload[0]  # Read padding count
     encoded_bytes = compressed_payload[1:]  # Actual payload
 
+    if strict and (padding > 7 or len(encoded_bytes) * 8 < padding):
+        raise ValueError(f"Invalid padding count {padding}")
+
     # Convert bytes to bitstring
-    bit_string = ''
-    for byte in encoded_bytes:
-        bit_string += f"{byte:08b}"
+    bit_string = ''.join(map('{:08b}'.format, encoded_bytes))
 
     if padding:
         bit_string = bit_string[:-padding]  # Remove padding bits
@@ -199,9 +219,281 @@ def huffman_decompress_dsa(compressed_payload: bytes, codes: dict) -> bytes:
         else:
             node = node.right
 
+        # Bit sequence that matches no code
+        if node is None:
+            raise ValueError(f"Undecodable bit sequence at symbol {len(decoded)}")
+
         # Leaf node reached → append byte
         if node.byte is not None:
             decoded.append(node.byte)
             node = root  # Reset to root
 
+    # Stream must end exactly on a code boundary
+    if strict and node is not root:
+        raise ValueError("Payload ends in the middle of a code")
+
+    return bytes(decoded)
+
+
+# --- 6. ORDER-1 CONTEXT MODEL ---
+#
+# Each byte is coded with a table chosen by the byte before it. Contexts that
+# are too rare to pay for their own table share one fallback table. Tables are
+# stored as canonical code lengths, so no code strings go into the header.
+
+_DECODE_TABLE_BITS = 10  # Width of the direct lookup table per context
+
+
+def _build_context_frequency_maps(data: bytes) -> dict:
+    """Count frequency of each byte, grouped by the byte that precedes it."""
+    context_maps = {}
+    previous = 0  # First byte is coded in context 0
+    for byte_value in data:
+        frequency_map = context_maps.setdefault(previous, {})
+        frequency_map[byte_value] = frequency_map.get(byte_value, 0) + 1
+        previous = byte_value
+    return context_maps
+
+
+def _code_lengths(frequency_map: dict) -> dict:
+    """Return byte→code length for the Huffman code of a frequency map."""
+    codes = _generate_codes(_build_huffman_tree(frequency_map))
+    return {byte_value: len(code) for byte_value, code in codes.items()}
+
+
+def _canonical_codes(lengths: dict) -> dict:
+    """Assign canonical Huffman codes (as bit strings) from code lengths."""
+    codes = {}
+    code = 0
+    previous_length = 0
+    kraft = 0  # Sum of 2^-length, scaled so a full code equals 2^max_length
+
+    max_length = max(lengths.values(), default=0)
+    for byte_value, length in sorted(lengths.items(), key=lambda item: (item[1], item[0])):
+        if not 0 < length <= 255:
+            raise ValueError(f"Invalid code length {length}")
+        code <<= length - previous_length
+        codes[byte_value] = format(code, f'0{length}b')
+        code += 1
+        previous_length = length
+        kraft += 1 << (max_length - length)
+
+    if kraft > 1 << max_length:
+        raise ValueError("Code lengths do not form a prefix-free code")
+    return codes
+
+
+def _merge_frequency_maps(frequency_maps) -> dict:
+    """Add several frequency maps into one."""
+    combined = {}
+    for frequency_map in frequency_maps:
+        for byte_value, frequency in frequency_map.items():
+            combined[byte_value] = combined.get(byte_value, 0) + frequency
+    return combined
+
+
+def _coded_bits(frequency_map: dict, lengths: dict) -> int:
+    """Number of payload bits needed to code a frequency map with given code lengths."""
+    return sum(frequency * lengths[b] for b, frequency in frequency_map.items())
+
+
+def _table_bits(lengths: dict) -> int:
+    """Header bits for one table: symbol count (2 bytes) + (symbol, length) pairs."""
+    return (2 + 2 * len(lengths)) * 8
+
+
+def _choose_context_tables(context_maps: dict) -> tuple[list, dict]:
+    """Pick contexts worth a dedicated table; merge the rest into one shared table."""
+    own_lengths = {context: _code_lengths(fm) for context, fm in context_maps.items()}
+    own_bits = {context: _coded_bits(fm, own_lengths[context]) + _table_bits(own_lengths[context]) + 8
+                for context, fm in context_maps.items()}  # + 8 for the context byte
+
+    # A context's shared-table cost depends on which contexts end up in the
+    # shared table, so start by pricing against one order-0 table of all data,
+    # then re-price against the shared table the previous choice produced.
+    # Each choice is costed exactly and the cheapest one is kept.
+    reference = _code_lengths(_merge_frequency_maps(context_maps.values()))
+    best = None
+    for _ in range(4):
+        dedicated = {context for context, fm in context_maps.items()
+                     if own_bits[context] < _coded_bits(fm, reference)}
+        shared = _merge_frequency_maps(fm for context, fm in context_maps.items()
+                                       if context not in dedicated)
+        shared_lengths = _code_lengths(shared) if shared else {}
+
+        total = (sum(own_bits[context] for context in dedicated)
+                 + _coded_bits(shared, shared_lengths) + _table_bits(shared_lengths))
+        if best is None or total < best[0]:
+            best = (total, dedicated, shared_lengths)
+        elif dedicated == best[1]:
+            break
+
+        # Symbols missing from the shared table keep their previous price
+        reference = {**reference, **shared_lengths}
+
+    _, dedicated, shared_lengths = best
+    return [(context, own_lengths[context]) for context in sorted(dedicated)], shared_lengths
+
+
+def _serialize_lengths(lengths: dict) -> bytes:
+    """Serialize one table as: symbol count (2 bytes), symbols, code lengths."""
+    symbols = sorted(lengths)
+    return (len(symbols).to_bytes(2, 'big') + bytes(symbols)
+            + bytes(lengths[s] for s in symbols))
+
+
+def _serialize_context_tables(dedicated: list, shared_lengths: dict) -> bytes:
+    """Serialize dedicated context tables followed by the shared table."""
+    serialized_parts = [len(dedicated).to_bytes(2, 'big')]
+    serialized_parts.append(bytes(context for context, _ in dedicated))
+    for _, lengths in dedicated:
+        serialized_parts.append(_serialize_lengths(lengths))
+    serialized_parts.append(_serialize_lengths(shared_lengths))
+
+    serialized_data = b''.join(serialized_parts)
+
+    # Prefix with 4-byte length header
+    length_prefix = len(serialized_data).to_bytes(4, 'big')
+    return length_prefix + serialized_data
+
+
+def deserialize_context_tables(serialized_data: bytes):
+    """Deserialize context tables; return a per-context list of length tuples + remaining payload."""
+    if len(serialized_data) < 4:
+        raise ValueError("Truncated context table header")
+    dict_length = int.from_bytes(serialized_data[:4], 'big')
+    payload = serialized_data[4:4 + dict_length]
+    if len(payload) < dict_length:
+        raise ValueError("Context tables run past end of file")
+
+    def read(i, count):
+        if i + count > len(payload):
+            raise ValueError("Truncated context table")
+        return payload[i:i + count], i + count
+
+    def read_lengths(i):
+        raw, i = read(i, 2)
+        symbol_count = int.from_bytes(raw, 'big')
+        symbols, i = read(i, symbol_count)
+        lengths, i = read(i, symbol_count)
+        return tuple(zip(symbols, lengths)), i
+
+    raw, i = read(0, 2)
+    contexts, i = read(i, int.from_bytes(raw, 'big'))
+
+    dedicated = []
+    for _ in contexts:
+        table, i = read_lengths(i)
+        dedicated.append(table)
+    shared, i = read_lengths(i)
+
+    # Map every previous-byte context to its table
+    tables = [shared] * 256
+    for context, table in zip(contexts, dedicated):
+        tables[context] = table
+
+    return tables, serialized_data[4 + dict_length:]
+
+
+def _build_decode_table(lengths: tuple) -> tuple[int, list, dict, int]:
+    """Prebuild a lookup table for one context: (width, table, long_codes, max_length).
+
+    table[next `width` bits] is (byte, length) for codes up to `width` bits, or
+    None when the code is longer; long codes are looked up by bit string.
+    """
+    codes = _canonical_codes(dict(lengths))
+    max_length = max((length for _, length in lengths), default=0)
+    width = min(max_length, _DECODE_TABLE_BITS)
+
+    table = [None] * (1 << width)
+    long_codes = {}
+    for byte_value, code in codes.items():
+        if len(code) > width:
+            long_codes[code] = byte_value
+            continue
+        # Every `width`-bit index starting with this code decodes to it
+        start = int(code, 2) << (width - len(code))
+        entry = (byte_value, len(code))
+        for index in range(start, start + (1 << (width - len(code)))):
+            table[index] = entry
+
+    return width, table, long_codes, max_length
+
+
+def huffman_compress_order1(data: bytes) -> tuple[bytes, bytes]:
+    """Compress data with per-context (order-1) Huffman tables; return header + payload."""
+    if not data:
+        return b'', b''
+
+    dedicated, shared_lengths = _choose_context_tables(_build_context_frequency_maps(data))
+
+    # Byte→code mapping for each of the 256 contexts
+    shared_codes = _canonical_codes(shared_lengths)
+    context_codes = [shared_codes] * 256
+    for context, lengths in dedicated:
+        context_codes[context] = _canonical_codes(lengths)
+
+    # Encode input to bitstring, switching table on the previous byte
+    encoded_bits = "".join(context_codes[previous][b]
+                           for previous, b in zip(b'\x00' + data[:-1], data))
+
+    # Pad to byte boundary
+    padding = -len(encoded_bits) % 8
+    encoded_bits += '0' * padding
+
+    compressed_payload = bytes([padding]) + int(encoded_bits, 2).to_bytes(len(encoded_bits) // 8, 'big')
+
+    return _serialize_context_tables(dedicated, shared_lengths), compressed_payload
+
+
+def huffman_decompress_order1(compressed_payload: bytes, tables: list) -> bytes:
+    """Decompress an order-1 payload; raise ValueError if it is corrupt."""
+    if not compressed_payload:
+        return b''
+
+    padding = compressed_payload[0]  # Read padding count
+    encoded_bytes = compressed_payload[1:]
+    total_bits = len(encoded_bytes) * 8 - padding
+    if padding > 7 or total_bits < 0:
+        raise ValueError(f"Invalid padding count {padding}")
+
+    # Prebuild one decoder per distinct table; contexts sharing a table share its decoder
+    built = {}
+    decoders = []
+    for lengths in tables:
+        if lengths not in built:
+            built[lengths] = _build_decode_table(lengths)
+        decoders.append(built[lengths])
+
+    # Extra zero bits let the last lookup read a full window
+    bit_string = format(int.from_bytes(encoded_bytes, 'big'), f'0{len(encoded_bytes) * 8}b')
+    bit_string += '0' * _DECODE_TABLE_BITS
+
+    decoded = bytearray()
+    previous = 0
+    pos = 0
+    while pos < total_bits:
+        width, table, long_codes, max_length = decoders[previous]
+        if not width:
+            raise ValueError(f"No code table for context {previous}")
+
+        entry = table[int(bit_string[pos:pos + width], 2)]
+        if entry is None:
+            # Code longer than the lookup window
+            for length in range(width + 1, max_length + 1):
+                byte_value = long_codes.get(bit_string[pos:pos + length])
+                if byte_value is not None:
+                    entry = (byte_value, length)
+                    break
+            else:
+                raise ValueError(f"Undecodable bit sequence at symbol {len(decoded)}")
+
+        byte_value, length = entry
+        pos += length
+        decoded.append(byte_value)
+        previous = byte_value
+
+    if pos != total_bits:
+        raise ValueError("Payload ends in the middle of a code")
+
     return bytes(decoded)
@@ -1,7 +1,7 @@
 import os
 from tkinter import filedialog
 import customtkinter as ctk
-from process import encode, decode
+from process import encode, decode, make_flags, parse_flags
 import threading
 
 def file_dialog():
@@ -87,9 +87,11 @@ def set_mode(mode):
     if mode == "compress":
         file_label.configure(text="Select File to Compress:")
         start_btn.configure(text="Start Compression")
+        order1_checkbox.configure(state="normal")
     else:
         file_label.configure(text="Select File to Decompress:")
         start_btn.configure(text="Start Decompression")
+        order1_checkbox.configure(state="disabled")
 
 def make_compressed_filename(filename):
     """Generate a compressed file name with .usa extension."""
@@ -125,7 +127,8 @@ def process():
             original_data = f.read()
         update_progress(0.4)  # update progress bar
 
-        compressed_data, rle_used = encode(original_data)
+        order1 = bool(order1_var.get())
+        compressed_data, rle_used = encode(original_data, order1)
 
         update_progress(0.8)
 
@@ -134,7 +137,7 @@ def process():
         destination_path = os.path.join(folder_path, file_name)
 
         with open(destination_path, "wb") as f:
-            f.write(bytes([1 if rle_used else 0]))
+            f.write(bytes([make_flags(rle_used, order1)]))
             f.write(compressed_data)
 
         update_progress(0.9)
@@ -153,13 +156,12 @@ def process():
         update_progress(0.05)  # update progress bar
 
         with open(file_path, "rb") as f:
-            rle_flag = f.read(1)[0]
-            rle_used = bool(rle_flag)
+            rle_used, order1, checksum = parse_flags(f.read(1)[0])
             compressed_data = f.read()
 
         update_progress(0.4)  # update progress bar
 
-        original_data = decode(compressed_data, rle_used)
+        original_data = decode(compressed_data, rle_used, order1, checksum)
 
         update_progress(0.6)  # update progress bar
 
@@ -229,6 +231,7 @@ def disable_all_buttons():
     decompression_button.configure(state="disabled")
     browse_file_btn.configure(state="disabled")
     browse_folder_btn.configure(state="disabled")
+    order1_checkbox.configure(state="disabled")
     start_btn.configure(state="disabled")
 
 def enable_all_buttons():
@@ -239,6 +242,8 @@ def enable_all_buttons():
     decompression_button.configure(state="normal")
     browse_file_btn.configure(state="normal")
     browse_folder_btn.configure(state="normal")
+    if current_mode == "compress":
+        order1_checkbox.configure(state="normal")
     start_btn.configure(state="normal")
 
 def update_progress(value):
@@ -307,6 +312,11 @@ process_result = {}
 compression_button = ctk.CTkButton(frame1, text="Compress",command=lambda: set_mode("compress"),font= TITLE_FONT)
 compression_button.pack(side="left", padx=10, pady=10)
 
+# Optional order-1 context modeling (compression only)
+order1_var = ctk.IntVar(value=0)
+order1_checkbox = ctk.CTkCheckBox(frame1, text="Context Model", variable=order1_var, font=LABEL_FONT)
+order1_checkbox.pack(side="left", padx=10, pady=10)
+
 decompression_button = ctk.CTkButton(frame1, text="Decompress",command=lambda: set_mode("decompress"),font= TITLE_FONT)
 decompression_button.pack(side="right", padx=10, pady=10)
 
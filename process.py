@@ -1,13 +1,68 @@
+import zlib
 from  rle import rle_compress,rle_decompress
 from huffman import huffman_compress_dsa,deserialize_codes,huffman_decompress_dsa
+from huffman import huffman_compress_order1,deserialize_context_tables,huffman_decompress_order1
 
+TRAILER_SIZE = 12  # CRC32 (4 bytes) + original length (8 bytes)
 
-def encode(data):
+# Bits of the flag byte at the start of every .usa archive
+FLAG_RLE = 1  # RLE was applied before Huffman
+FLAG_ORDER1 = 2  # Order-1 context tables instead of one Huffman table
+FLAG_CHECKSUM = 4  # Data ends with a CRC32 + length trailer
+FLAG_MASK = FLAG_RLE | FLAG_ORDER1 | FLAG_CHECKSUM
+
+
+def make_flags(rle_used, order1, checksum=True):
+    """Build the archive flag byte value."""
+
+    return (FLAG_RLE if rle_used else 0) | (FLAG_ORDER1 if order1 else 0) | (FLAG_CHECKSUM if checksum else 0)
+
+def parse_flags(flags):
+    """Split the archive flag byte into (rle_used, order1, checksum)."""
+
+    # Unknown bits mean a corrupt or newer-format archive
+    if flags & ~FLAG_MASK:
+        raise ValueError(f"Invalid flag byte {flags}")
+    return bool(flags & FLAG_RLE), bool(flags & FLAG_ORDER1), bool(flags & FLAG_CHECKSUM)
+
+
+class ChecksumError(ValueError):
+    """Restored data does not match the stored length or CRC32."""
+
+
+def _make_trailer(data):
+    """Build the integrity trailer: CRC32 and length of the original data."""
+
+    return zlib.crc32(data).to_bytes(4, 'big') + len(data).to_bytes(8, 'big')
+
+def _split_trailer(data):
+    """Separate the trailer from compressed data; return data, crc, length."""
+
+    if len(data) < TRAILER_SIZE:
+        raise ValueError("Truncated checksum trailer")
+    trailer = data[-TRAILER_SIZE:]
+    return data[:-TRAILER_SIZE], int.from_bytes(trailer[:4], 'big'), int.from_bytes(trailer[4:], 'big')
+
+def _check_trailer(original, crc, length):
+    """Raise ChecksumError if restored data does not match the stored length and CRC32."""
+
+    if len(original) != length:
+        raise ChecksumError(f"Length mismatch: expected {length} bytes, got {len(original)}")
+    if zlib.crc32(original) != crc:
+        raise ChecksumError("CRC32 mismatch")
+
+
+def encode(data, order1=False):
     """
         Compress the input data using RLE first, then Huffman encoding.
 
+        Args:
+            data: bytes object to compress
+            order1: if True, code each byte with a Huffman table chosen by the previous byte
+
         Returns:
-            compressed_data: bytes object containing the final compressed data
+            compressed_data: bytes object containing the final compressed data,
+                             ending with a CRC32 + length trailer
             rle_used: boolean indicating whether RLE was effective
 
     """
@@ -15,35 +70,110 @@ def encode(data):
     # First compress with RLE
     rle_compressed, rle_used = rle_compress(data)
     # Then compress with Huffman and get header + payload
-    serialized_codes_header, compressed_payload = huffman_compress_dsa(rle_compressed)
+    if order1:
+        serialized_codes_header, compressed_payload = huffman_compress_order1(rle_compressed)
+    else:
+        serialized_codes_header, compressed_payload = huffman_compress_dsa(rle_compressed)
 
-    # Combine header and payload
-    compressed_data = serialized_codes_header + compressed_payload
+    # Combine header, payload and integrity trailer
+    compressed_data = serialized_codes_header + compressed_payload + _make_trailer(data)
 
     # Return the final compressed data and whether RLE was used
     return compressed_data,rle_used
 
-def decode(data,rle_used):
+def decode(data,rle_used,order1=False,checksum=True):
     """
         Decompress data that was compressed with encode().
 
         Args:
             data: bytes object of compressed data
             rle_used: boolean indicating if RLE was applied during encoding
+            order1: boolean indicating if order-1 context tables were used
+            checksum: boolean indicating if data ends with a CRC32 + length trailer
+                      (False for archives written before the trailer existed)
 
         Returns:
             decompressed_data: original uncompressed bytes
+
+        Raises:
+            ChecksumError: if the restored data does not match the trailer
     """
 
-    # Separate Huffman header from payload
-    deserialized_codes, payload_from_file = deserialize_codes(data)
-    # Decompress Huffman
-    huffman_decomp = huffman_decompress_dsa(payload_from_file, deserialized_codes)
+    if checksum:
+        data, crc, length = _split_trailer(data)
+
+    # Separate Huffman header from payload, then decompress Huffman
+    if order1:
+        context_tables, payload_from_file = deserialize_context_tables(data)
+        huffman_decomp = huffman_decompress_order1(payload_from_file, context_tables)
+    else:
+        deserialized_codes, payload_from_file = deserialize_codes(data)
+        huffman_decomp = huffman_decompress_dsa(payload_from_file, deserialized_codes)
     # If RLE was used, decompress it
     if rle_used:
         decompressed_data = rle_decompress(huffman_decomp)
     else:
         decompressed_data = huffman_decomp
 
+    if checksum:
+        _check_trailer(decompressed_data, crc, length)
+
     # Return the fully decompressed data
     return decompressed_data
+
+def verify(data, rle_used, order1=False, checksum=True):
+    """
+        Check that data compressed with encode() decodes cleanly, without writing anything.
+
+        Args:
+            data: bytes object of compressed data
+            rle_used: boolean indicating if RLE was applied during encoding
+            order1: boolean indicating if order-1 context tables were used
+            checksum: boolean indicating if data ends with a CRC32 + length trailer;
+                      without it only the structure can be checked
+
+        Returns:
+            restored_size: length in bytes of the original data
+
+        Raises:
+            ChecksumError: if the restored data does not match the trailer
+            ValueError: if the header, Huffman payload or RLE stream is corrupt
+    """
+
+    if checksum:
+        data, crc, length = _split_trailer(data)
+
+    # Header must fit inside the file
+    if len(data) < 4:
+        raise ValueError("Truncated Huffman header")
+    if 4 + int.from_bytes(data[:4], 'big') > len(data):
+        raise ValueError("Code table runs past end of file")
+
+    # Decode Huffman into a scratch buffer that is discarded afterwards
+    if order1:
+        # The order-1 decoder already rejects corrupt input
+        context_tables, payload_from_file = deserialize_context_tables(data)
+        huffman_decomp = huffman_decompress_order1(payload_from_file, context_tables)
+    else:
+        deserialized_codes, payload_from_file = deserialize_codes(data)
+        huffman_decomp = huffman_decompress_dsa(payload_from_file, deserialized_codes, strict=True)
+
+    if rle_used:
+        # RLE stream is (byte, run_length) pairs
+        if len(huffman_decomp) % 2:
+            raise ValueError("RLE stream has an odd number of bytes")
+        run_lengths = huffman_decomp[1::2]
+        if 0 in run_lengths:
+            raise ValueError("RLE stream contains a zero-length run")
+        restored_size = sum(run_lengths)
+    else:
+        restored_size = len(huffman_decomp)
+
+    if checksum:
+        if restored_size != length:
+            raise ChecksumError(f"Length mismatch: expected {length} bytes, got {restored_size}")
+        # CRC needs the restored bytes; they stay in memory and are discarded
+        original = rle_decompress(huffman_decomp) if rle_used else huffman_decomp
+        _check_trailer(original, crc, length)
+
+    return restored_size
@@ -0,0 +1,114 @@
+import os
+import sys
+import json
+import time
+import argparse
+from concurrent.futures import ProcessPoolExecutor
+from process import verify, parse_flags, ChecksumError
+
+
+def verify_archive(path):
+    """Verify one .usa archive and return a report entry for it."""
+
+    result = {
+        "path": path,
+        "ok": False,
+        "error": None,
+        "rle_used": None,
+        "order1": None,
+        "checksum": None,
+        "compressed_size": None,
+        "restored_size": None,
+        "seconds": None,
+    }
+
+    start = time.perf_counter()
+    try:
+        with open(path, "rb") as f:
+            rle_flag = f.read(1)
+            compressed_data = f.read()
+
+        if not rle_flag:
+            raise ValueError("Empty archive")
+
+        result["rle_used"], result["order1"], checksum = parse_flags(rle_flag[0])
+        result["compressed_size"] = len(compressed_data)
+        result["restored_size"] = verify(compressed_data, result["rle_used"], result["order1"], checksum)
+        result["ok"] = True
+        # Archives without a trailer only had their structure checked
+        result["checksum"] = True if checksum else None
+    except ChecksumError as e:
+        # Archive decoded cleanly but the trailer did not match
+        result["error"] = str(e)
+        result["checksum"] = False
+    except (OSError, ValueError, IndexError) as e:
+        # IndexError comes from a code table cut off mid-entry
+        result["error"] = str(e) or type(e).__name__
+
+    result["seconds"] = round(time.perf_counter() - start, 4)
+    return result
+
+
+def find_archives(folder):
+    """Return sorted paths of all .usa files under the folder."""
+
+    archives = []
+    for root, _, files in os.walk(folder):
+        for name in files:
+            if name.lower().endswith(".usa"):
+                archives.append(os.path.join(root, name))
+    return sorted(archives)
+
+
+def verify_archives(archives, workers=None):
+    """Verify archives in parallel, one archive per worker task."""
+
+    if not archives:
+        return []
+
+    # Decoding is CPU bound, so use processes rather than threads
+    with ProcessPoolExecutor(max_workers=workers) as executor:
+        return list(executor.map(verify_archive, archives))
+
+
+def positive_int(value):
+    """argparse type for a worker count of at least 1."""
+
+    number = int(value)
+    if number < 1:
+        raise argparse.ArgumentTypeError(f"must be at least 1, got {number}")
+    return number
+
+
+def main():
+    """Command-line entry point: print a JSON report, exit 1 if any archive fails."""
+
+    parser = argparse.ArgumentParser(description="Check .usa archives without writing decompressed files.")
+    parser.add_argument("paths", nargs="+", help=".usa files or folders containing them")
+    parser.add_argument("-j", "--workers", type=positive_int, default=None, help="number of worker processes (default: CPU count)")
+    args = parser.parse_args()
+
+    # Gather every archive first so all of them share one worker pool
+    archives = []
+    for path in args.paths:
+        if os.path.isdir(path):
+            archives.extend(find_archives(path))
+        else:
+            archives.append(path)
+
+    results = verify_archives(archives, args.workers)
+
+    report = {
+        "total": len(results),
+        "failed": sum(not r["ok"] for r in results),
+        "unchecksummed": sum(r["ok"] and r["checksum"] is None for r in results),
+        "archives": results,
+    }
+    json.dump(report, sys.stdout, indent=2)
+    print()
+
+    return 1 if report["failed"] else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())